@@ -1,11 +1,13 @@
-import json
+import orjson
 import re
-import time
+import asyncio
 from pathlib import Path
-from typing import Dict, Any, Iterable, Set
+from typing import Dict, Any, AsyncIterator, Set
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import os
 from dotenv import load_dotenv
-import requests
+import httpx
 from tqdm import tqdm
 load_dotenv()
 
@@ -33,69 +35,138 @@ DATASETS = {
 BASE_URL = "https://dblp.org/search/publ/api"
 PAGE_SIZE = 1000
 SLEEP_SEC = 0.3
+MAX_CONCURRENT_PAGES = 4
+# throttled (429) or failing (5xx) pages are retried, waiting Retry-After when given
+DBLP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+DBLP_MAX_ATTEMPTS = 5
+DBLP_BACKOFF_SEC = 5
+WRITE_BATCH = 1024
 RESUME = True
+# raw file keeps only DOI-bearing records; normalize_dois drops the rest anyway
+DOI_ONLY = True
+
+_DOI_URL_RE = re.compile(r"^https?://(dx\.)?doi\.org/")
+_DOI_PREFIX_RE = re.compile(r"^doi:\s*")
+_DOI_FIELD_RE = re.compile(rb'"doi_normalized"\s*:\s*"([^"]*)"')
 
 
 def normalize_doi(doi: str) -> str:
     doi = doi.strip().lower()
-    doi = re.sub(r"^https?://(dx\.)?doi\.org/", "", doi)
-    doi = re.sub(r"^doi:\s*", "", doi)
+    doi = _DOI_URL_RE.sub("", doi)
+    doi = _DOI_PREFIX_RE.sub("", doi)
     doi = doi.rstrip(" .;")
     return doi
 
-def fetch_page(query: str, offset: int) -> Dict[str, Any]:
+def retry_delay(r: httpx.Response, attempt: int) -> float:
+    # Retry-After is either delay-seconds or an HTTP date; otherwise back off linearly
+    ra = r.headers.get("Retry-After", "").strip()
+    if ra.isdigit():
+        return float(ra)
+    try:
+        return max(0.0, (parsedate_to_datetime(ra) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return DBLP_BACKOFF_SEC * attempt
+
+async def afetch_page(client: httpx.AsyncClient, sem: asyncio.Semaphore, query: str, offset: int) -> Dict[str, Any]:
     params = {"q": query, "h": PAGE_SIZE, "f": offset, "format": "json"}
-    r = requests.get(BASE_URL, params=params, timeout=60)
-    r.raise_for_status()
+    async with sem:
+        for attempt in range(1, DBLP_MAX_ATTEMPTS + 1):
+            r = await client.get(BASE_URL, params=params, timeout=60)
+            if r.status_code not in DBLP_RETRY_STATUSES or attempt == DBLP_MAX_ATTEMPTS:
+                break
+            # back off while keeping the slot, so a throttled crawl also sends less
+            await asyncio.sleep(retry_delay(r, attempt))
+        r.raise_for_status()
+        # hold the slot a little longer so each slot stays SLEEP_SEC apart
+        await asyncio.sleep(SLEEP_SEC)
     return r.json()
 
-def get_total_hits(query: str) -> int:
-    first = fetch_page(query, 0)
-    return int(first["result"]["hits"]["@total"])
-
-def iter_hits(query: str) -> Iterable[Dict[str, Any]]:
-    offset = 0
-    while True:
-        data = fetch_page(query, offset)
-        hits = data.get("result", {}).get("hits", {}).get("hit", [])
-        if not hits:
-            break
-        for h in hits:
-            yield h.get("info", {})
-        offset += PAGE_SIZE
-        time.sleep(SLEEP_SEC)
+async def aiter_hits(query: str) -> AsyncIterator[Dict[str, Any]]:
+    # page 0 gives @total (sizing the progress bar); the remaining pages are
+    # fetched at most MAX_CONCURRENT_PAGES at a time and yielded in arrival order
+    sem = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+    # requests.get followed dblp.org redirects; httpx only does when asked
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        first = await afetch_page(client, sem, query, 0)
+        total = int(first["result"]["hits"]["@total"])
+        tasks = [asyncio.ensure_future(afetch_page(client, sem, query, offset))
+                 for offset in range(PAGE_SIZE, total, PAGE_SIZE)]
+        try:
+            with tqdm(total=total) as pbar:
+                for h in first.get("result", {}).get("hits", {}).get("hit", []):
+                    pbar.update()
+                    yield h.get("info", {})
+                for next_page in asyncio.as_completed(tasks):
+                    data = await next_page
+                    for h in data.get("result", {}).get("hits", {}).get("hit", []):
+                        pbar.update()
+                        yield h.get("info", {})
+        finally:
+            for t in tasks:
+                t.cancel()
+
+def seen_path(path: Path) -> Path:
+    # sidecar with one dedup key per line, kept in sync with the jsonl output
+    return path.with_suffix(path.suffix + ".seen")
 
 def load_seen(path: Path, field: str) -> Set[str]:
+    sidecar = seen_path(path)
+    if sidecar.exists():
+        # only trusted while its jsonl exists and has not been written after it;
+        # a leftover sidecar next to a deleted jsonl would mark everything as seen
+        if path.exists() and sidecar.stat().st_mtime >= path.stat().st_mtime:
+            return set(filter(None, sidecar.read_text(encoding="utf-8").splitlines()))
+        sidecar.unlink()
+
+    # bootstrap: no (usable) sidecar, rebuild it from the jsonl once
     seen = set()
     if path.exists():
-        with path.open("r", encoding="utf-8") as f:
+        with path.open("rb") as f:
             for line in f:
-                rec = json.loads(line)
+                rec = orjson.loads(line)
                 v = rec.get(field)
                 if v:
                     seen.add(v)
+        sidecar.write_text("".join(v + "\n" for v in seen), encoding="utf-8")
     return seen
 
-def download_dblp(query: str, out_path: Path):
+def flush_batch(f, lines, f_seen, keys):
+    # records before their dedup keys: a crash in between can cause a duplicate, never a gap
+    f.write(b"".join(lines))
+    f_seen.write("".join(keys))
+    # flush in the same order so the sidecar's mtime never trails the jsonl's
+    f.flush()
+    f_seen.flush()
+    lines.clear()
+    keys.clear()
+
+async def download_dblp(query: str, out_path: Path):
     out_path.parent.mkdir(parents=True, exist_ok=True)
     seen = load_seen(out_path, "key") if RESUME else set()
-    total = get_total_hits(query)
 
     mode = "a" if RESUME else "w"
-    written = skipped = 0
+    written = skipped = no_doi = 0
+    lines, keys = [], []
 
-    with out_path.open(mode, encoding="utf-8") as f:
-        for rec in tqdm(iter_hits(query), total=total):
+    with out_path.open(mode + "b") as f, seen_path(out_path).open(mode, encoding="utf-8") as f_seen:
+        async for rec in aiter_hits(query):
+            if DOI_ONLY and not rec.get("doi"):
+                no_doi += 1
+                continue
             k = rec.get("key")
             if RESUME and k in seen:
                 skipped += 1
                 continue
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            lines.append(orjson.dumps(rec) + b"\n")
             if k:
                 seen.add(k)
+                keys.append(k + "\n")
             written += 1
+            if len(lines) >= WRITE_BATCH:
+                flush_batch(f, lines, f_seen, keys)
+        flush_batch(f, lines, f_seen, keys)
 
-    print(f"[DBLP] {out_path} | written={written}, skipped={skipped}")
+    print(f"[DBLP] {out_path} | written={written}, skipped={skipped}, no_doi={no_doi}")
 
 def normalize_dois(in_path: Path, out_path: Path):
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -103,10 +174,12 @@ def normalize_dois(in_path: Path, out_path: Path):
 
     mode = "a" if RESUME else "w"
     written = skipped = missing = 0
+    lines, keys = [], []
 
-    with in_path.open("r", encoding="utf-8") as f_in, out_path.open(mode, encoding="utf-8") as f_out:
+    with in_path.open("rb") as f_in, out_path.open(mode + "b") as f_out, \
+            seen_path(out_path).open(mode, encoding="utf-8") as f_seen:
         for line in f_in:
-            rec = json.loads(line)
+            rec = orjson.loads(line)
             raw = rec.get("doi")
             if not raw:
                 missing += 1
@@ -118,20 +191,25 @@ def normalize_dois(in_path: Path, out_path: Path):
                 continue
 
             rec["doi_normalized"] = doi
-            f_out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            lines.append(orjson.dumps(rec) + b"\n")
             seen.add(doi)
+            keys.append(doi + "\n")
             written += 1
+            if len(lines) >= WRITE_BATCH:
+                flush_batch(f_out, lines, f_seen, keys)
+        flush_batch(f_out, lines, f_seen, keys)
 
     print(f"[DOI]  {out_path} | written={written}, missing={missing}, skipped={skipped}")
 
 def validate(path: Path):
     n = n_bad = 0
-    with path.open("r", encoding="utf-8") as f:
+    with path.open("rb") as f:
         for line in f:
-            rec = json.loads(line)
-            doi = rec.get("doi_normalized")
+            # byte scan for the one field we check; no per-line JSON parse
+            m = _DOI_FIELD_RE.search(line)
+            doi = m.group(1) if m else None
             n += 1
-            if not doi or doi != doi.lower() or doi.startswith("http"):
+            if not doi or doi != doi.lower() or doi.startswith(b"http"):
                 n_bad += 1
     print(f"[CHECK] {path} | total={n}, problematic={n_bad}")
 
@@ -142,7 +220,7 @@ def main():
         print("\n" + "=" * 70)
         print(f"PROCESSING: {name.upper()}")
 
-        download_dblp(cfg["query"], cfg["raw_path"])
+        asyncio.run(download_dblp(cfg["query"], cfg["raw_path"]))
         normalize_dois(cfg["raw_path"], cfg["doi_path"])
         validate(cfg["doi_path"])
         
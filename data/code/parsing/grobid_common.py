@@ -0,0 +1,83 @@
+import os
+import time
+import hashlib
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from concurrent.futures import wait, FIRST_COMPLETED
+from itertools import islice
+
+# When GROBID is busy (503) or times out, wait and resubmit with a fresh upload
+# instead of dropping the PDF (same strategy as grobid_client_python's sleep_time)
+GROBID_RETRY_STATUSES = {503, 408, 504}
+GROBID_BUSY_SLEEP_SEC = 5
+GROBID_BUSY_MAX_ROUNDS = 10
+HASH_CHUNK = 1 << 20
+
+def make_session(pool_size):
+    """One keep-alive pool to share between all worker threads of a script.
+
+    Uploads are streamed from disk, which urllib3 can't replay, so it only
+    retries failed connects (nothing sent yet).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, read=0, backoff_factor=0.5),
+    )
+    session.mount("http://", adapter)
+    return session
+
+def write_cache(cache_file, xml):
+    # write-then-rename so an interrupted run never leaves a truncated TEI behind
+    tmp = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(xml, encoding='utf-8')
+    os.replace(tmp, cache_file)
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def post_pdf(session, url, pdf_path, timeout):
+    """Streams one PDF to GROBID, backing off while the server answers busy/timeout."""
+    for attempt in range(1, GROBID_BUSY_MAX_ROUNDS + 1):
+        with open(pdf_path, 'rb') as f:
+            m = MultipartEncoder(fields={'input': (pdf_path.name, f, 'application/pdf')})
+            response = session.post(
+                url,
+                data=m,
+                headers={'Content-Type': m.content_type, 'Accept': 'application/xml'},
+                timeout=timeout
+            )
+        if response.status_code not in GROBID_RETRY_STATUSES or attempt == GROBID_BUSY_MAX_ROUNDS:
+            return response
+        time.sleep(GROBID_BUSY_SLEEP_SEC * attempt)
+
+def fetch_tei(session, url, pdf_path, cache_dir, timeout):
+    """Returns (xml, None) from the sha256-keyed cache or GROBID, or (None, status) on failure."""
+    cache_file = cache_dir / f"{file_sha256(pdf_path)}.xml"
+    if cache_file.exists():
+        return cache_file.read_text(encoding='utf-8'), None
+    response = post_pdf(session, url, pdf_path, timeout)
+    if response.status_code != 200:
+        return None, response.status_code
+    write_cache(cache_file, response.text)
+    return response.text, None
+
+def iter_completed(executor, fn, items, window):
+    """Yields (item, future) as tasks finish, keeping at most `window` submitted at once."""
+    pending = iter(items)
+    futures = {executor.submit(fn, item): item for item in islice(pending, window)}
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = futures.pop(future)
+            for nxt in islice(pending, 1):
+                futures[executor.submit(fn, nxt)] = nxt
+            yield item, future
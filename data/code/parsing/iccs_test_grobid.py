@@ -2,47 +2,80 @@ import os
 import re
 import json
 import time
-import requests
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from grobid_common import make_session, fetch_tei, iter_completed
 
 # ICCS_PDF_DIR = Path(r"D:\ITMO Big Data & ML School\semester 3\RI3\notebooks\data\pdfs\icss_truncated\2025")
 # ICCS_PARSED_DIR = Path(r"D:\ITMO Big Data & ML School\semester 3\RI3\parsed\iccs_2025_test")
 ICCS_PDF_DIR = Path(r"D:\ITMO Big Data & ML School\semester 3\RI3\notebooks\data\pdfs\icss_truncated\2024")
 ICCS_PARSED_DIR = Path(r"D:\ITMO Big Data & ML School\semester 3\RI3\parsed\iccs_2024_test")
+# Raw TEI keyed by sha256 of the PDF, so reruns reparse locally instead of re-calling GROBID
+XML_CACHE_DIR = ICCS_PARSED_DIR / "_tei_cache"
 
 # Using consolidateHeader=1 to improve metadata accuracy via external lookup
 GROBID_URL_HEADER = "http://localhost:8070/api/processHeaderDocument?consolidateHeader=1"
 
-def extract_keywords_robust(root, ns):
-    """Extracts keywords using explicit namespace mapping to avoid dictionary bugs."""
+# max_workers=6 is the sweet spot for an RTX 3050
+MAX_WORKERS = 6
+
+# One keep-alive pool shared by all worker threads
+_SESSION = make_session(MAX_WORKERS)
+
+_KW_PREFIX_RE = re.compile(r'^(Keywords?|Index Terms?)[:\s]*', re.IGNORECASE)
+_KW_SPLIT_RE = re.compile(r'[;\n]')
+
+TEI = '{http://www.tei-c.org/ns/1.0}'
+# Clark-notation tags: compared/looked up directly, no prefix->namespace mapping per call
+Q_AUTHOR = TEI + 'author'
+Q_AFFIL = TEI + 'affiliation'
+Q_TITLE = TEI + 'title'
+Q_TITLESTMT = TEI + 'titleStmt'
+Q_ABSTRACT = TEI + 'abstract'
+Q_PROFILEDESC = TEI + 'profileDesc'
+Q_SOURCEDESC = TEI + 'sourceDesc'
+Q_KEYWORDS = TEI + 'keywords'
+Q_TERM = TEI + 'term'
+Q_PERSNAME = TEI + 'persName'
+Q_FORENAME = TEI + 'forename'
+Q_SURNAME = TEI + 'surname'
+Q_ORGNAME = TEI + 'orgName'
+ORGNAME_PATH = './/' + Q_ORGNAME
+AUTHORS_PATH = './/' + Q_SOURCEDESC + '//' + Q_AUTHOR
+AFFILS_PATH = './/' + Q_SOURCEDESC + '//' + Q_AFFIL
+TITLE_PATH = './/' + Q_TITLESTMT + '/' + Q_TITLE
+ABSTRACT_PATH = './/' + Q_PROFILEDESC + '/' + Q_ABSTRACT
+PROFILE_TERMS_PATH = './/' + Q_PROFILEDESC + '//' + Q_KEYWORDS + '//' + Q_TERM
+XML_ID = '{http://www.w3.org/XML/1998/namespace}id'
+
+def extract_keywords_robust(root):
+    """Extracts keywords using Clark-notation paths, so no namespace map is needed."""
     keywords_list = []
-    for term in root.findall('.//tei:profileDesc//tei:keywords//tei:term', namespaces=ns):
+    for term in root.iterfind(PROFILE_TERMS_PATH):
         if term.text:
             keywords_list.append(term.text.strip())
     
     if not keywords_list:
-        for node in root.findall('.//tei:keywords', namespaces=ns):
+        for node in root.iter(Q_KEYWORDS):
             text = "".join(node.itertext()).strip()
             # Remove "Keywords" prefix if present
-            text = re.sub(r'^(Keywords?|Index Terms?)[:\s]*', '', text, flags=re.IGNORECASE)
-            keywords_list.extend([k.strip() for k in re.split(r'[;\n]', text) if len(k.strip()) > 2])
+            text = _KW_PREFIX_RE.sub('', text)
+            keywords_list.extend([k.strip() for k in _KW_SPLIT_RE.split(text) if len(k.strip()) > 2])
 
     return ", ".join(list(dict.fromkeys(keywords_list))[:12])
 
 def parse_grobid_xml(xml_string, filename):
     """Parses TEI XML with specific logic for author-affiliation marker matching."""
     try:
-        ns = {'tei': 'http://www.tei-c.org/ns/1.0'}
-        root = ET.fromstring(xml_string)
+        root = ET.fromstring(xml_string.encode('utf-8'))
 
         # 1. Map ALL global affiliations first (Fallback for markers)
         global_affils = {}
-        for i, aff in enumerate(root.findall('.//tei:sourceDesc//tei:affiliation', ns)):
-            aff_id = aff.get('{http://www.w3.org/XML/1998/namespace}id')
+        for i, aff in enumerate(root.iterfind(AFFILS_PATH)):
+            aff_id = aff.get(XML_ID)
             # Extract orgNames (Dept, University, etc.)
-            parts = [org.text.strip() for org in aff.findall('.//tei:orgName', ns) if org.text]
+            parts = [org.text.strip() for org in aff.findall(ORGNAME_PATH) if org.text]
             content = ", ".join(parts) if parts else "".join(aff.itertext()).strip()
             
             # Index by 1-based count and by XML ID
@@ -51,13 +84,13 @@ def parse_grobid_xml(xml_string, filename):
 
         # 2. Extract Authors and resolve their specific affiliations
         authors_data = []
-        for author in root.findall('.//tei:sourceDesc//tei:author', ns):
-            persName = author.find('tei:persName', ns)
+        for author in root.iterfind(AUTHORS_PATH):
+            persName = author.find(Q_PERSNAME)
             if persName is None: continue
             
             # --- Name Extraction ---
-            first = " ".join([n.text for n in persName.findall('tei:forename', namespaces=ns) if n.text])
-            last = persName.findtext('tei:surname', default="", namespaces=ns)
+            first = " ".join([n.text for n in persName.findall(Q_FORENAME) if n.text])
+            last = persName.findtext(Q_SURNAME, default="")
             raw_full_name = f"{first} {last}".strip()
 
             # --- Marker & ORCID Capture ---
@@ -77,8 +110,8 @@ def parse_grobid_xml(xml_string, filename):
             final_affils = []
             
             # Strategy A: Nested Affiliations (Preferred)
-            for aff in author.findall('tei:affiliation', namespaces=ns):
-                curr = ", ".join([org.text for org in aff.findall('.//tei:orgName', namespaces=ns) if org.text])
+            for aff in author.findall(Q_AFFIL):
+                curr = ", ".join([org.text for org in aff.findall(ORGNAME_PATH) if org.text])
                 if not curr: curr = "".join(aff.itertext()).strip()
                 if curr: final_affils.append(curr)
 
@@ -93,13 +126,13 @@ def parse_grobid_xml(xml_string, filename):
             })
 
         # 3. Final Metadata Assembly
-        title_node = root.find('.//tei:titleStmt/tei:title', ns)
+        title_node = root.find(TITLE_PATH)
         title = "".join(title_node.itertext()).strip() if title_node is not None else "Unknown Title"
         
-        abstract_node = root.find('.//tei:profileDesc/tei:abstract', ns)
+        abstract_node = root.find(ABSTRACT_PATH)
         abstract = "".join(abstract_node.itertext()).strip() if abstract_node is not None else ""
         
-        keywords = extract_keywords_robust(root, ns)
+        keywords = extract_keywords_robust(root)
 
         return {
             "title": title, 
@@ -122,20 +155,15 @@ def process_pdf(pdf_path):
         json_file = output_folder / f"{pdf_path.stem}.json"
         if json_file.exists(): return "SKIP"
 
-        with open(pdf_path, 'rb') as f:
-            response = requests.post(
-                GROBID_URL_HEADER,
-                files={'input': f},
-                headers={"Accept": "application/xml"},
-                timeout=150  # Generous timeout for consolidation
-            )
-        
-        if response.status_code == 200:
-            data = parse_grobid_xml(response.text, pdf_path.name)
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            return "SUCCESS"
-        return f"ERROR_{response.status_code}"
+        # Generous timeout for consolidation
+        xml, status = fetch_tei(_SESSION, GROBID_URL_HEADER, pdf_path, XML_CACHE_DIR, timeout=150)
+        if xml is None:
+            return f"ERROR_{status}"
+
+        data = parse_grobid_xml(xml, pdf_path.name)
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return "SUCCESS"
     except Exception as e:
         return f"CRASH_{str(e)}"
 
@@ -143,6 +171,7 @@ if __name__ == "__main__":
     if not ICCS_PDF_DIR.exists():
         print(f"Directory not found: {ICCS_PDF_DIR}")
         exit(1)
+    XML_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
     all_pdfs = list(ICCS_PDF_DIR.rglob("*.pdf"))
     print(f"--- Starting Processing ---")
@@ -152,16 +181,16 @@ if __name__ == "__main__":
     start_time = time.time()
     success, skipped, errors = 0, 0, 0
 
-    # max_workers=6 is the sweet spot for an RTX 3050 
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        futures = {executor.submit(process_pdf, p): p for p in all_pdfs}
-        for i, future in enumerate(as_completed(futures)):
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Sliding window: only 2 x MAX_WORKERS PDFs are queued at any time
+        completed = iter_completed(executor, process_pdf, all_pdfs, MAX_WORKERS * 2)
+        for i, (pdf, future) in enumerate(completed):
             res = future.result()
             if res == "SUCCESS": success += 1
             elif res == "SKIP": skipped += 1
             else: 
                 errors += 1
-                print(f"Failed: {futures[future].name} -> {res}")
+                print(f"Failed: {pdf.name} -> {res}")
             
             if (i + 1) % 5 == 0 or (i + 1) == len(all_pdfs):
                 print(f"Status: [{i+1}/{len(all_pdfs)}] | Success: {success} | Errors: {errors}")
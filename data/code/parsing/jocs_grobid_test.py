@@ -2,54 +2,93 @@ import os
 import re
 import json
 import time
-import requests
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from grobid_common import make_session, fetch_tei, iter_completed
 import random
 
 JOCS_PDF_DIR = Path(r"D:\ITMO Big Data & ML School\semester 3\ri3_repo\data\data_files\pdfs\jocs")
 TEST_OUTPUT_DIR = Path(r"D:\ITMO Big Data & ML School\semester 3\ri3_repo\data\data_files\parsed\jocs_grobid\all")
 GROBID_URL = "http://localhost:8070/api/processFulltextDocument"
+MAX_WORKERS = 4
 
-TEST_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+# One keep-alive pool shared by all worker threads
+_SESSION = make_session(MAX_WORKERS)
+
+# Raw TEI keyed by sha256 of the PDF, so reruns reparse locally instead of re-calling GROBID
+XML_CACHE_DIR = TEST_OUTPUT_DIR / "_tei_cache"
 
-def extract_keywords_robust(root, ns):
+TEST_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+XML_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+_KW_PREFIX_RE = re.compile(r'^(Keywords?|Index Terms?|Key words?)[:\s]*', re.IGNORECASE)
+_KW_SPLIT_RE = re.compile(r'[\n;]')
+_KW_CAPS_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[a-z]+)*(?=\s+[A-Z]|$)')
+
+TEI = '{http://www.tei-c.org/ns/1.0}'
+# Clark-notation tags: compared/looked up directly, no prefix->namespace mapping per call
+Q_AUTHOR = TEI + 'author'
+Q_AFFIL = TEI + 'affiliation'
+Q_TITLE = TEI + 'title'
+Q_TITLESTMT = TEI + 'titleStmt'
+Q_ABSTRACT = TEI + 'abstract'
+Q_PROFILEDESC = TEI + 'profileDesc'
+Q_SOURCEDESC = TEI + 'sourceDesc'
+Q_KEYWORDS = TEI + 'keywords'
+Q_TERM = TEI + 'term'
+Q_PERSNAME = TEI + 'persName'
+Q_FORENAME = TEI + 'forename'
+Q_SURNAME = TEI + 'surname'
+Q_ORGNAME = TEI + 'orgName'
+Q_TEXT = TEI + 'text'
+Q_ADDRESS = TEI + 'address'
+ORGNAME_PATH = './/' + Q_ORGNAME
+ADDRESS_PARTS_PATH = './/' + Q_ADDRESS + '/*'
+AUTHORS_PATH = './/' + Q_SOURCEDESC + '//' + Q_AUTHOR
+TITLE_PATH = './/' + Q_TITLESTMT + '/' + Q_TITLE
+ABSTRACT_PATH = './/' + Q_PROFILEDESC + '/' + Q_ABSTRACT
+
+def keywords_bucket(node):
+    """profileDesc or text if the node sits under one (profileDesc first), else None."""
+    for tag in (Q_PROFILEDESC, Q_TEXT):
+        if next(node.iterancestors(tag), None) is not None:
+            return tag
+    return None
+
+def extract_keywords_robust(root):
     """Extract and format keywords as comma-separated list."""
     keywords_list = []
-
-    # Multiple XPath locations for keywords
-    xpath_patterns = [
-        './/tei:profileDesc//tei:keywords//tei:term',
-        './/tei:text//tei:keywords//tei:term',
-        './/tei:keywords//tei:term',
-        './/tei:biblStruct//tei:keywords//tei:term'
-    ]
-
-    for xpath in xpath_patterns:
-        for term in root.findall(xpath, ns):
+    keyword_nodes = list(root.iter(Q_KEYWORDS))
+
+    # One walk over the keywords nodes, bucketed so the old XPath precedence
+    # holds: profileDesc, then text, then anywhere else (biblStruct...)
+    buckets = {Q_PROFILEDESC: [], Q_TEXT: [], None: []}
+    for node in keyword_nodes:
+        bucket = buckets[keywords_bucket(node)]
+        for term in node.iter(Q_TERM):
             if term.text and term.text.strip():
-                kw = term.text.strip()
-                keywords_list.append(kw)
+                bucket.append(term.text.strip())
+    for terms in buckets.values():
+        keywords_list.extend(terms)
 
     # If no structured terms, try raw keywords text
     if not keywords_list:
-        for keywords_node in root.findall('.//tei:keywords', ns):
+        for keywords_node in keyword_nodes:
             raw_text = "".join(keywords_node.itertext()).strip()
 
             # Remove prefix
-            raw_text = re.sub(r'^(Keywords?|Index Terms?|Key words?)[:\s]*', '', 
-                             raw_text, flags=re.IGNORECASE)
+            raw_text = _KW_PREFIX_RE.sub('', raw_text)
 
             if raw_text:
                 # Split by common academic keyword separators
-                candidates = re.split(r'[\n;]', raw_text)
+                candidates = _KW_SPLIT_RE.split(raw_text)
 
                 for candidate in candidates:
                     kw = candidate.strip()
                     if kw and len(kw) > 2:
                         # Split long phrases by capitalized words
-                        sub_words = re.findall(r'\b[A-Z][a-z]+(?:\s+[a-z]+)*(?=\s+[A-Z]|$)', kw)
+                        sub_words = _KW_CAPS_RE.findall(kw)
                         keywords_list.extend(sub_words)
 
     # Clean, dedupe, format
@@ -59,25 +98,24 @@ def extract_keywords_robust(root, ns):
 
 def parse_grobid_xml(xml_string, filename):
     try:
-        ns = {'tei': 'http://www.tei-c.org/ns/1.0'}
-        root = ET.fromstring(xml_string)
+        root = ET.fromstring(xml_string.encode('utf-8'))
 
         # Title
-        title_node = root.find('.//tei:titleStmt/tei:title', ns)
+        title_node = root.find(TITLE_PATH)
         title = "".join(title_node.itertext()).strip() if title_node is not None else ""
 
         # FULL NAMES + AFFILIATIONS
         authors_data = []
-        for author in root.findall('.//tei:sourceDesc//tei:author', ns):
-            persName = author.find('tei:persName', ns)
+        for author in root.iterfind(AUTHORS_PATH):
+            persName = author.find(Q_PERSNAME)
             if persName is None: continue
 
             # Extract ALL name components
-            forename_nodes = persName.findall('tei:forename', ns)
-            surname_node = persName.find('tei:surname', ns)
+            forename_nodes = persName.findall(Q_FORENAME)
+            surname_node = persName.find(Q_SURNAME)
 
             name_parts = []
-            for node in persName.iter():
+            for node in persName.iter(ET.Element):
                 if node.text and node.tag.endswith('forename'):
                     name_parts.append(node.text.strip())
                 elif node.tag.endswith('surname') and node.text:
@@ -92,9 +130,9 @@ def parse_grobid_xml(xml_string, filename):
 
             # Extract affiliations
             affils = []
-            for affil in author.findall('tei:affiliation', ns):
-                parts = [org.text.strip() for org in affil.findall('.//tei:orgName', ns) if org.text]
-                addr = [node.text.strip() for node in affil.findall('.//tei:address/*', ns) if node.text]
+            for affil in author.findall(Q_AFFIL):
+                parts = [org.text.strip() for org in affil.findall(ORGNAME_PATH) if org.text]
+                addr = [node.text.strip() for node in affil.findall(ADDRESS_PARTS_PATH) if node.text]
                 combined = ", ".join(list(dict.fromkeys(parts + addr)))
                 if combined: 
                     affils.append(combined)
@@ -105,11 +143,11 @@ def parse_grobid_xml(xml_string, filename):
             })
 
         # Abstract
-        abstract_node = root.find('.//tei:profileDesc/tei:abstract', ns)
+        abstract_node = root.find(ABSTRACT_PATH)
         abstract = "".join(abstract_node.itertext()).strip() if abstract_node is not None else ""
 
         # KEYWORDS
-        keywords_str = extract_keywords_robust(root, ns)
+        keywords_str = extract_keywords_robust(root)
 
         return {
             "title": title,
@@ -128,19 +166,11 @@ def process_pdf(pdf_path):
         if json_file.exists():
             return "SKIP"
 
-        with open(pdf_path, 'rb') as f:
-            files = {'input': f}
-            response = requests.post(
-                GROBID_URL, 
-                files=files, 
-                headers={'Accept': 'application/xml'}, 
-                timeout=60
-            )
-
-        if response.status_code != 200:
-            return f"ERROR_{response.status_code}"
+        xml, status = fetch_tei(_SESSION, GROBID_URL, pdf_path, XML_CACHE_DIR, timeout=60)
+        if xml is None:
+            return f"ERROR_{status}"
 
-        data = parse_grobid_xml(response.text, pdf_path.name)
+        data = parse_grobid_xml(xml, pdf_path.name)
 
         with open(json_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
@@ -161,10 +191,11 @@ errors = 0
 
 start_time = time.time()
 
-with ThreadPoolExecutor(max_workers=4) as executor:
-    futures = {executor.submit(process_pdf, p): p for p in all_pdfs}
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    # Sliding window: only 2 x MAX_WORKERS PDFs are queued at any time
+    completed = iter_completed(executor, process_pdf, all_pdfs, MAX_WORKERS * 2)
 
-    for i, future in enumerate(as_completed(futures)):
+    for i, (pdf, future) in enumerate(completed):
         result = future.result()
 
         if result == "SUCCESS":
@@ -173,7 +204,7 @@ with ThreadPoolExecutor(max_workers=4) as executor:
             skipped += 1
         else:
             errors += 1
-            print(f"{futures[future].name}: {result}")
+            print(f"{pdf.name}: {result}")
 
         print(f"[{i+1}/20] {result}")
 
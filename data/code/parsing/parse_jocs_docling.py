@@ -1,10 +1,17 @@
-import os, json, re, random, time
+import os, json, re, random, time, queue
+from collections import deque
 from pathlib import Path
-from multiprocessing import Process, Queue
+from multiprocessing import Pool
 from datetime import datetime
 from dotenv import load_dotenv
 
-from docling.document_converter import DocumentConverter
+# torch/OpenMP threads per worker; must be set before docling pulls in torch
+os.environ.setdefault("OMP_NUM_THREADS", "4")
+
+from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
 
 load_dotenv()
 if not os.getenv("JOCS_PDF_DIR") or not os.getenv("JOCS_PARSED_DIR"):
@@ -19,15 +26,24 @@ SUCCESS_LOG = OUT_DIR / "success.log"
 ERROR_LOG = OUT_DIR / "error.log"
 
 MAX_SECONDS_PER_PDF = 90
+# one worker per OMP_NUM_THREADS-sized slice of the machine
+N_WORKERS = max(1, (os.cpu_count() or 1) // int(os.environ["OMP_NUM_THREADS"]))
+# worker is recycled (and its converter rebuilt) after this many PDFs to cap leaked memory
+MAX_TASKS_PER_WORKER = 25
 # N_RANDOM = 20 #test
 
 
 HEADER_MARKER = re.compile(r"locate/jocs\s*\n\n", re.DOTALL)
 ARTICLE_INFO_START = re.compile(r"(?i)A\s*R\s*T\s*I\s*C\s*L\s*E\s+I\s*N\s*F\s*O", re.MULTILINE)
 ABSTRACT_START = re.compile(r"(?i)^#*\s*A\s*B\s*[S\$]\s*T\s*R\s*A\s*[C€]\s*T", re.MULTILINE)
+_KW_RE = re.compile(r"(?i)Keywords:\s*(.*?)(?=\n\n|A\s*B\s*S\s*T\s*R\s*A\s*C\s*T|Introduction|©)", re.DOTALL)
+_CAP_SPLIT_RE = re.compile(r'(?<=[a-z0-9])\s+(?=[A-Z])')
+_STAR_RE = re.compile(r'[_*]')
+_INTRO_RE = re.compile(r'(?i)Introduction|\n{2,}')
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
 
 def clean_markdown_tags(text):
-    return re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL).strip()
+    return _HTML_COMMENT_RE.sub("", text).strip()
 
 def _log_line(path: Path, line: str):
     with open(path, "a", encoding="utf-8") as f:
@@ -42,11 +58,34 @@ def log_error(fn, seconds, reason):
     _log_line(ERROR_LOG, f"{ts}\t{fn}\t{seconds:.2f}s\t{reason}")
 
 
+# set once per worker process by init_worker, reused for every PDF that worker handles
+_CONVERTER = None
+
+def init_worker():
+    global _CONVERTER
+    # Only page-1 metadata is read, so skip OCR/table models and use the lighter pypdfium backend
+    pipeline_options = PdfPipelineOptions(do_ocr=False, do_table_structure=False)
+    _CONVERTER = DocumentConverter(format_options={
+        InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options, backend=PyPdfiumDocumentBackend)
+    })
+
+def new_pool():
+    return Pool(processes=N_WORKERS, initializer=init_worker, maxtasksperchild=MAX_TASKS_PER_WORKER)
+
+def submit(pool, generation, i, pdf_path, out_path, done: queue.Queue):
+    """Queues one PDF on the pool; its result lands in `done` tagged with (generation, i)."""
+    tag = (generation, i)
+    pool.apply_async(
+        worker_convert_and_parse, (pdf_path, out_path),
+        callback=lambda msg: done.put((tag, msg)),
+        error_callback=lambda e: done.put((tag, {"ok": False, "err": repr(e)})),
+    )
+
+
 # worker must be top-level for Windows multiprocessing
-def worker_convert_and_parse(pdf_path, out_path, q: Queue):
+def worker_convert_and_parse(pdf_path, out_path):
     try:
-        converter = DocumentConverter()
-        doc = converter.convert(pdf_path, max_num_pages=1).document
+        doc = _CONVERTER.convert(pdf_path, max_num_pages=1).document
         text = clean_markdown_tags(doc.export_to_markdown())
 
         # METADATA
@@ -62,21 +101,18 @@ def worker_convert_and_parse(pdf_path, out_path, q: Queue):
 
         # KEYWORDS
         keywords_text = ""
-        kw_match = re.search(
-            r"(?i)Keywords:\s*(.*?)(?=\n\n|A\s*B\s*S\s*T\s*R\s*A\s*C\s*T|Introduction|©)",
-            text, re.DOTALL
-        )
+        kw_match = _KW_RE.search(text)
         if kw_match:
             raw_content = kw_match.group(1).replace('\n', ' ').strip()
-            split_content = re.sub(r'(?<=[a-z0-9])\s+(?=[A-Z])', ', ', raw_content)
-            keywords_text = re.sub(r'[_*]', '', split_content).strip()
+            split_content = _CAP_SPLIT_RE.sub(', ', raw_content)
+            keywords_text = _STAR_RE.sub('', split_content).strip()
 
         # ABSTRACT
         abstract_text = ""
         abs_parts = ABSTRACT_START.split(text)
         if len(abs_parts) > 1:
             after_abstract = abs_parts[1].strip()
-            candidate = re.split(r'(?i)Introduction|\n{2,}', after_abstract)[0].strip()
+            candidate = _INTRO_RE.split(after_abstract)[0].strip()
             if len(candidate) < 100:
                 candidate = "\n\n".join(after_abstract.split('\n\n')[:2]).strip()
             abstract_text = candidate.strip()
@@ -93,11 +129,11 @@ def worker_convert_and_parse(pdf_path, out_path, q: Queue):
         with open(out_path, "w", encoding="utf-8") as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
 
-        q.put({"ok": True})
+        return {"ok": True}
 
     except Exception as e:
         # Python exceptions will be captured here; native crashes will not.
-        q.put({"ok": False, "err": repr(e)})
+        return {"ok": False, "err": repr(e)}
 
 
 def main():
@@ -112,40 +148,53 @@ def main():
 
     print(f"Testing {len(files)} random PDFs...")
 
-    for i, fn in enumerate(files, start=1):
-        pdf_path = os.path.join(PDF_DIR, fn)
-        out_path = str(OUT_DIR / f"{Path(fn).stem}.json")
-
-        t0 = time.time()
-        q = Queue()
-        p = Process(target=worker_convert_and_parse, args=(pdf_path, out_path, q), daemon=True)
-
-        print(f"[{i}/{len(files)}] {fn}", end=" ... ")
-        p.start()
-        p.join(timeout=MAX_SECONDS_PER_PDF)
-
-        elapsed = time.time() - t0
-
-        if p.is_alive():
-            p.terminate()
-            p.join(timeout=5)
-            log_error(fn, elapsed, f"TIMEOUT>{MAX_SECONDS_PER_PDF}s")
-            print(f"TIMEOUT ({elapsed:.2f}s)")
-            continue
-
-        # If the worker died due to a native crash, queue will likely be empty.
-        if q.empty():
-            log_error(fn, elapsed, "WORKER_CRASHED (native PDF/parser crash)")
-            print(f"CRASHED ({elapsed:.2f}s)")
-            continue
-
-        msg = q.get()
-        if msg.get("ok"):
-            log_success(fn, elapsed, Path(out_path).name)
-            print(f"OK ({elapsed:.2f}s)")
-        else:
-            log_error(fn, elapsed, msg.get("err", "Unknown error"))
-            print(f"ERROR ({elapsed:.2f}s)")
+    pending = deque(enumerate(files, start=1))
+    running = {}  # i -> (fn, out_path, started)
+    done = queue.Queue()
+    generation = 0
+    pool = new_pool()
+    try:
+        while pending or running:
+            while pending and len(running) < N_WORKERS:
+                i, fn = pending.popleft()
+                pdf_path = os.path.join(PDF_DIR, fn)
+                out_path = str(OUT_DIR / f"{Path(fn).stem}.json")
+                submit(pool, generation, i, pdf_path, out_path, done)
+                running[i] = (fn, out_path, time.time())
+
+            oldest = min(running, key=lambda k: running[k][2])
+            deadline = running[oldest][2] + MAX_SECONDS_PER_PDF
+            try:
+                (gen, i), msg = done.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                # A stuck worker can't be interrupted, and a natively crashed one never
+                # answers: both end up here. Replace the pool so the next PDF starts clean,
+                # and rerun the PDFs that were sharing it.
+                fn, _, t0 = running.pop(oldest)
+                pool.terminate()
+                pool.join()
+                pool = new_pool()
+                generation += 1
+                pending.extendleft(sorted(((k, v[0]) for k, v in running.items()), reverse=True))
+                running.clear()
+                elapsed = time.time() - t0
+                log_error(fn, elapsed, f"TIMEOUT>{MAX_SECONDS_PER_PDF}s")
+                print(f"[{oldest}/{len(files)}] {fn} ... TIMEOUT ({elapsed:.2f}s)")
+                continue
+
+            if gen != generation or i not in running:
+                continue  # finished just as its pool was being replaced
+            fn, out_path, t0 = running.pop(i)
+            elapsed = time.time() - t0
+            if msg.get("ok"):
+                log_success(fn, elapsed, Path(out_path).name)
+                print(f"[{i}/{len(files)}] {fn} ... OK ({elapsed:.2f}s)")
+            else:
+                log_error(fn, elapsed, msg.get("err", "Unknown error"))
+                print(f"[{i}/{len(files)}] {fn} ... ERROR ({elapsed:.2f}s)")
+    finally:
+        pool.terminate()
+        pool.join()
 
     print("Done.")
     print("Success log:", SUCCESS_LOG)
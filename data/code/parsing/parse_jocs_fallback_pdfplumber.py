@@ -1,8 +1,17 @@
 import os, re, json, time
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-import pdfplumber
+from functools import lru_cache
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 from dotenv import load_dotenv
+try:
+    import orjson
+except ImportError:  # stdlib json writes the same indented output, just slower
+    orjson = None
 
 load_dotenv()
 if not os.getenv("JOCS_PDF_DIR") or not os.getenv("JOCS_PARSED_DIR"):
@@ -19,11 +28,19 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 STAGE_TIMEOUT_ERROR_LOG = OUT_DIR / "still_error_timeouts_stage2.log"
 
+N_WORKERS = os.cpu_count() or 1
 
 
+
+# Same ligature expansion pdfplumber applies to extracted words
+LIGATURES = {"ﬀ": "ff", "ﬃ": "ffi", "ﬄ": "ffl", "ﬁ": "fi", "ﬂ": "fl", "ﬆ": "st", "ﬅ": "st"}
+
 # SUPERSCRIPT
-SUP_TO_DIGIT = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
 DIGIT_TO_SUP = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+# single-char lookups; markers are almost always one digit
+SUP_DIGIT = dict(zip("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789"))
+DIGIT_SUP = dict(zip("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹"))
+CORRESPONDING_MARKS = frozenset("*∗⁎")
 
 
 # REGEXES
@@ -35,15 +52,50 @@ RE_ABS_HDR = re.compile(
     r"(ABSTRACT|A\s*B\s*S\s*T\s*R\s*A\s*C\s*T|a\s*b\s*s\s*t\s*r\s*a\s*c\s*t)",
     re.I
 )
-RE_STOP_ANY = re.compile(
-    r"(ARTICLE\s+INFO|ABSTRACT|Keywords|Key\s*words|Article\s+history|Received|Accepted|Available\s+online)",
+
+# end of the front matter: article-info / abstract headers (also the letter-spaced
+# "A R T I C L E I N F O" / "A B S T R A C T" JoCS prints), keywords or history lines
+RE_FRONT_STOP = re.compile(
+    r"a\s*r\s*t\s*i\s*c\s*l\s*e\s+i\s*n\s*f\s*o|a\s*b\s*s\s*t\s*r\s*a\s*c\s*t"
+    r"|Keywords|Key\s*words|Article\s+history|Received|Accepted|Available\s+online",
     re.I
 )
 
 # Stop for abstract/keywords extraction
 RE_INTRO = re.compile(r"(^|\s)(Introduction|1\.\s*Introduction)\b", re.I)
 RE_COPY = re.compile(r"(©|Copyright)", re.I)
-RE_KEYWORDS_HDR = re.compile(r"\b(Key\s*words|Keywords)\b", re.I)
+# error.log rows are "<ts>\t<file>\t<secs>\t<reason>"; the trimmed second field must be a .pdf
+RE_TIMEOUT_LINE = re.compile(r"^[^\t]*\t[^\S\t]*([^\t]*?\.pdf)[^\S\t]*(?:\t|$)", re.I)
+# keywords / abstract / introduction headers as named alternatives for section_hdr_re
+SECTION_HDRS = (
+    ("kw", r"\b(?:Key\s*words|Keywords)\b"),
+    ("abs", r"a\s*b\s*s\s*t\s*r\s*a\s*c\s*t"),
+    ("intro", r"(?:^|\s)(?:1\.\s*)?Introduction\b"),
+)
+RE_KW_PREFIX = re.compile(r"(?i)\bKeywords?\b\s*:?\s*(.*)$")
+RE_ABS_PREFIX = re.compile(r"(?i)\bAbstract\b\s*:?\s*(.*)$")
+
+# Inline patterns, compiled once instead of per call
+RE_WS = re.compile(r"\s+")
+RE_LOWER_UPPER = re.compile(r"([a-z])([A-Z])")
+RE_CAMEL_WORDS = re.compile(r"\b(of|and|the|for|in|at|to|with|from|by|de|la|le|des|du)([A-Z])", re.I)
+RE_OF_ARTICLE = re.compile(r"\b(of)(the|a|an)\b", re.I)
+RE_NUM5 = re.compile(r"\d{5,6}")
+RE_COUNTRY = re.compile(r"\b(USA|UK|India|China|Germany|France|Japan|Canada|Australia)\b", re.I)
+# Journal banner phrases as they read once whitespace is removed and lowercased
+RE_BANNER = re.compile(
+    r"journalofcomputationalscience|sciencedirect|contentslistsavailable|journalhomepage"
+    r"|www\.elsevier\.com|elsevier\.com/locate|checkforupdates|crossmark|^elsevier$"
+)
+RE_PAGE_RANGE = re.compile(r"^\d+\s*\(\d{4}\)\s*\d+[\s–\-]*\d*$")
+RE_TOKENIZE = re.compile(r"[A-Za-zÀ-ž]+|[0-9]+|[⁰¹²³⁴⁵⁶⁷⁸⁹]|[,.*∗⁎]")
+RE_DIGITS = re.compile(r"\d+")
+RE_COMMA_SPLIT = re.compile(r"\s*,\s*")
+RE_STAR = re.compile(r"[*∗⁎]")
+RE_MARKER_LINE = re.compile(r"^\s*([a-z])\s+(.*)$")
+RE_MARKER_LINE2 = re.compile(r"^\s*([a-z])([A-Z]. *)$")
+# affiliation line opening with a letter marker, spaced ("a Dept") or merged ("aDept")
+RE_MARKER_START = re.compile(r"^\s*[a-z]\s*[A-Z]")
 
 
 # UTILITIES
@@ -51,43 +103,54 @@ AFF_CUES = re.compile(
     r"\b(Department|Dept\. ?|School|Institute|Faculty|Center|Centre|Laboratory|Lab|University|Universit|College|Hospital|Academy|Research\s+Group|IIT|MIT|ETH|CNRS|INRIA)\b",
     re.I
 )
+# Matched on whitespace-collapsed lowercase text, so "Univ ersity" still counts
+AFF_KEYWORDS = (
+    "department","school","institute","faculty","center","centre","laboratory",
+    "university","college","hospital","academy","iit","mit","eth","cnrs","inria"
+)
+RE_AFF_KW = re.compile("|".join(AFF_KEYWORDS))
 AFF_CUES_MERGED = re.compile(
     r"(Department|School|Institute|Faculty|Center|Centre|Laboratory|University|College|Hospital|Academy)",
     re.I
 )
 
+def split_camel(text: str) -> str:
+    # search() first: most inputs have no aB joint, and sub() costs more even when it finds none
+    if RE_LOWER_UPPER.search(text) is None:
+        return text
+    return RE_LOWER_UPPER.sub(r'\1 \2', text)
+
 def fix_merged_text(text: str) -> str:
     if not text:
         return ""
+    return _fix_merged_text_cached(text)
+
+# Same names/institutions recur within and across PDFs (per worker process)
+@lru_cache(maxsize=4096)
+def _fix_merged_text_cached(text: str) -> str:
     text = text.strip()
     words = text.split()
     if len(words) >= 3:
         return text
     if len(text) > 15 and len(words) <= 2:
-        fixed = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        fixed = re.sub(r'\b(of|and|the|for|in|at|to|with|from|by|de|la|le|des|du)([A-Z])', r'\1 \2', fixed, flags=re.I)
-        fixed = re.sub(r'\b(of)(the|a|an)\b', r'\1 \2', fixed, flags=re.I)
+        fixed = split_camel(text)
+        fixed = RE_CAMEL_WORDS.sub(r'\1 \2', fixed)
+        fixed = RE_OF_ARTICLE.sub(r'\1 \2', fixed)
         return fixed
     if len(words) == 1 and len(text) > 10:
-        fixed = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        return fixed
+        return split_camel(text)
     return text
 
 def is_likely_affiliation(text: str) -> bool:
     if not text:
         return False
     t = text.strip()
-    t_collapsed = re.sub(r"\s+", "", t).lower()
-    aff_keywords = [
-        "department","school","institute","faculty","center","centre","laboratory",
-        "university","college","hospital","academy","iit","mit","eth","cnrs","inria"
-    ]
-    for kw in aff_keywords:
-        if kw in t_collapsed:
-            return True
-    if re.search(r"\d{5,6}", t):
+    # inputs are built from cluster_lines text, where the only whitespace left is " "
+    if RE_AFF_KW.search(t.replace(" ", "").lower()):
         return True
-    if re.search(r"\b(USA|UK|India|China|Germany|France|Japan|Canada|Australia)\b", t, re.I):
+    if RE_NUM5.search(t):
+        return True
+    if RE_COUNTRY.search(t):
         return True
     return False
 
@@ -95,28 +158,11 @@ def is_header_banner(text: str) -> bool:
     if not text:
         return False
     t = text.strip()
-    t_lower = t.lower()
-    t_collapsed = re.sub(r"\s+", "", t_lower)
     if len(t) < 3:
         return False
-    if "journalofcomputationalscience" in t_collapsed:
-        return True
-    if t_lower.startswith("journal of computational science"):
-        return True
-    if re.match(r"^journal\s+of\s+computational\s+science\s*$", t_lower):
-        return True
-    if re.search(r"journal\s+of\s+computational\s+science\s+\d+\s*\(\d{4}\)", t_lower):
-        return True
-    if re.match(r"^\d+\s*\(\d{4}\)\s*\d+[\s–\-]*\d*$", t.strip()):
+    if RE_BANNER.search("".join(t.split()).lower()):
         return True
-    for pattern in [
-        "sciencedirect","contents lists available","contentslistsavailable",
-        "journal homepage","journalhomepage","www.elsevier.com","elsevier.com/locate",
-        "check for updates","checkforupdates","crossmark"
-    ]:
-        if pattern in t_collapsed or pattern in t_lower:
-            return True
-    if t_collapsed in {"sciencedirect", "elsevier"}:
+    if RE_PAGE_RANGE.match(t):
         return True
     return False
 
@@ -134,19 +180,22 @@ def cluster_lines(words, y_tol=3.0, x_tol=3.0):
     Improved clustering:
     - Added x_tol to preserve spaces between tight words.
     - Added sorting to ensure lines are read left-to-right.
+    - Words are swept top-down once, so each joins the current bucket or
+      opens a new one (no scan over every bucket per word). A bucket's y is
+      the running mean of its word tops, matched within +/- y_tol.
     """
     buckets = []
-    for w in words:
+    for w in sorted(words, key=lambda x: x["top"]):
         y = w["top"]
-        for b in buckets:
-            if abs(b["y"] - y) <= y_tol:
-                b["ws"].append(w)
-                break
+        if buckets and abs(y - buckets[-1]["y"]) <= y_tol:
+            b = buckets[-1]
+            b["ws"].append(w)
+            b["y"] += (y - b["y"]) / len(b["ws"])
         else:
             buckets.append({"y": y, "ws": [w]})
 
     lines = []
-    for b in sorted(buckets, key=lambda x: x["y"]):
+    for b in buckets:
         # Sort words by x0 (left-most position)
         ws = sorted(b["ws"], key=lambda x: x["x0"])
         
@@ -159,7 +208,7 @@ def cluster_lines(words, y_tol=3.0, x_tol=3.0):
                 parts.append(" ")
         
         text = " ".join(parts).strip()
-        text = re.sub(r'\s+', ' ', text) # Clean double spaces
+        text = RE_WS.sub(' ', text) # Clean double spaces
         
         if text:
             lines.append({
@@ -177,11 +226,10 @@ def find_y(lines, regex):
 
 
 # AUTHOR PARSING
-def extract_tokens_from_lines(lines):
-    tokens = []
+def iter_tokens(lines):
+    # findall per line stays in C; finditer + group() per token is ~2x slower here
     for li in lines:
-        tokens.extend(re.findall(r"[A-Za-zÀ-ž]+|[0-9]+|[⁰¹²³⁴⁵⁶⁷⁸⁹]|[,.*∗⁎]", li["text"]))
-    return tokens
+        yield from RE_TOKENIZE.findall(li["text"])
 
 def finalize_author(cur):
     name = " ".join(cur["name_parts"]).strip()
@@ -189,11 +237,10 @@ def finalize_author(cur):
     return {"name": name, "markers": sorted(cur["markers"]), "corresponding": cur["corresponding"]}
 
 def parse_authors_with_markers(author_lines):
-    tokens = extract_tokens_from_lines(author_lines)
     authors = []
     cur = {"name_parts": [], "markers": set(), "corresponding": False}
 
-    for tok in tokens:
+    for tok in iter_tokens(author_lines):
         if tok == ",":
             if cur["name_parts"]:
                 a = finalize_author(cur)
@@ -202,20 +249,21 @@ def parse_authors_with_markers(author_lines):
                 cur = {"name_parts": [], "markers": set(), "corresponding": False}
             continue
 
-        if tok in {"*", "∗", "⁎"}:
+        if tok in CORRESPONDING_MARKS:
             cur["corresponding"] = True
             continue
 
-        if re.fullmatch(r"[a-z]", tok):
+        if len(tok) == 1 and "a" <= tok <= "z":
             cur["markers"].add(tok)
             continue
 
-        if re.fullmatch(r"[0-9]+", tok):
-            cur["markers"].add(tok)
+        # before isdigit(), which is also true for superscripts
+        if tok in SUP_DIGIT:
+            cur["markers"].add(SUP_DIGIT[tok])
             continue
 
-        if tok in "⁰¹²³⁴⁵⁶⁷⁸⁹":
-            cur["markers"].add(tok.translate(SUP_TO_DIGIT))
+        if tok.isdigit():
+            cur["markers"].add(tok)
             continue
 
         cur["name_parts"].append(tok)
@@ -247,22 +295,22 @@ def parse_authors_without_markers(author_text):
             author_text = author_part
 
     author_text = fix_merged_text(author_text)
-    parts = re.split(r"\s*,\s*", author_text)
+    parts = RE_COMMA_SPLIT.split(author_text)
     authors = []
 
     for p in parts:
         p = p.strip()
         if not p:
             continue
-        if re.fullmatch(r"\d+", p):
+        if RE_DIGITS.fullmatch(p):
             continue
 
         if is_likely_affiliation(p):
             extracted_aff = (extracted_aff + ", " + p).strip(", ") if extracted_aff else p
             continue
 
-        corresponding = bool(re.search(r"[*∗⁎]", p))
-        p = re.sub(r"[*∗⁎]", "", p).strip()
+        corresponding = bool(RE_STAR.search(p))
+        p = RE_STAR.sub("", p).strip()
         p = fix_merged_text(p)
 
         if is_likely_affiliation(p):
@@ -283,16 +331,16 @@ def parse_affiliations_with_markers(aff_lines):
         t = li["text"].strip()
         if not t:
             continue
-        if RE_ARTINFO.search(t) or RE_ABS_HDR.search(t) or RE_STOP_ANY.search(t):
+        if RE_FRONT_STOP.search(t):
             break
 
-        m = re.match(r"^\s*([a-z])\s+(.*)$", t)
+        m = RE_MARKER_LINE.match(t)
         if m:
             last_key = m.group(1)
             affiliations[last_key] = fix_merged_text(m.group(2).strip())
             continue
 
-        m2 = re.match(r"^\s*([a-z])([A-Z]. *)$", t)
+        m2 = RE_MARKER_LINE2.match(t)
         if m2:
             last_key = m2.group(1)
             affiliations[last_key] = fix_merged_text(m2.group(2).strip())
@@ -309,116 +357,187 @@ def parse_affiliations_without_markers(aff_text):
         return {}
     if RE_ARTINFO.search(aff_text) or RE_ABS_HDR.search(aff_text):
         return {}
-    aff_text = re.sub(r"\s+", " ", aff_text).strip()
+    aff_text = RE_WS.sub(" ", aff_text).strip()
     aff_text = fix_merged_text(aff_text)
     return {"all": aff_text} if aff_text else {}
 
 
-# FRONT MATTER PARSER (PAGE 1)
-def parse_front_matter_page1(pdf_path: Path):
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        page = pdf.pages[0]
-        H = page.height
-
-        words = page.extract_words(extra_attrs=["size"], use_text_flow=True) or []
-        if not words:
-            return {"title": "", "authors": [], "affiliations": {}}
-
-        lines = cluster_lines(words, y_tol=3.0)
-
-        header_end_y = find_header_end_y(lines, H)
-        absinfo_y = find_y(lines, RE_ARTINFO) or find_y(lines, RE_ABS_HDR)
-        if absinfo_y is None:
-            absinfo_y = H * 0.62
+# PAGE 1 WORDS (raw pdfminer chars, no pdfplumber layout pass)
+def iter_chars(container):
+    for obj in container:
+        if isinstance(obj, LTChar):
+            yield obj
+        elif isinstance(obj, LTContainer):
+            yield from iter_chars(obj)
 
-        content_start_y = header_end_y
-        content_end_y = min(absinfo_y, H * 0.45)
-
-        top = [li for li in lines
-               if content_start_y <= li["y"] < content_end_y
-               and not is_header_banner(li["text"])]
+def extract_words_page1(pdf_path: Path, x_tol=3.0, y_tol=3.0):
+    """
+    Word dicts (text/x0/x1/top/size) for page 1, built straight from pdfminer's
+    LTChar stream. The aggregator gets laparams=None, so pdfminer's layout
+    pass (grouping chars into lines/boxes) never runs; extract_pages would
+    swap None for a default LAParams(). Splits words the way
+    pdfplumber's extract_words(use_text_flow=True, extra_attrs=["size"]) does:
+    on blank chars, size/orientation changes, backward or > x_tol gaps, and
+    > y_tol jumps in top.
+    """
+    rsrcmgr = PDFResourceManager()
+    device = PDFPageAggregator(rsrcmgr, laparams=None)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    with open(pdf_path, "rb") as fp:
+        for pdf_page in PDFPage.get_pages(fp, pagenos=[0], maxpages=1):
+            interpreter.process_page(pdf_page)
+            break
+        else:
+            raise ValueError("PDF has no pages")
+    page = device.get_result()
+
+    words, cur = [], []
+
+    def flush():
+        if cur:
+            words.append({
+                "text": "".join(c[0] for c in cur),
+                "x0": min(c[1] for c in cur),
+                "x1": max(c[2] for c in cur),
+                "top": min(c[3] for c in cur),
+                "size": cur[0][4],
+            })
+            cur.clear()
+
+    prev = None
+    for ch in iter_chars(page):
+        text = ch.get_text()
+        c = (LIGATURES.get(text, text), ch.x0, ch.x1, page.y1 - ch.y1, ch.size, ch.upright)
+        if text.isspace():
+            flush()
+        elif cur and (c[4] != prev[4] or c[5] != prev[5]
+                      or c[1] < prev[1] or c[1] > prev[2] + x_tol
+                      or abs(c[3] - prev[3]) > y_tol):
+            flush()
+            cur.append(c)
+        else:
+            cur.append(c)
+        prev = c
+    flush()
+    return words, page.height
 
-        if not top:
-            return {"title": "", "authors": [], "affiliations": {}}
 
-        max_font = max(li["max_size"] for li in top)
-        title_candidates = [li for li in top
-                            if li["max_size"] >= max_font - 1.5
-                            and not is_header_banner(li["text"])]
-        title_candidates.sort(key=lambda x: x["y"])
+# FRONT MATTER PARSER (PAGE 1)
+def read_page1_lines(pdf_path: Path):
+    """Clustered text lines and page height of page 1; the only place the PDF is opened."""
+    words, H = extract_words_page1(pdf_path)
+    return (cluster_lines(words, y_tol=3.0) if words else []), H
 
-        title_lines, last_y = [], None
-        for li in title_candidates:
-            if is_header_banner(li["text"]):
-                continue
-            if last_y is None or abs(li["y"] - last_y) <= 20:
-                title_lines.append(li)
-                last_y = li["y"]
-            else:
-                break
+def parse_front_matter_page1(pdf_path: Path):
+    lines, H = read_page1_lines(pdf_path)
+    return _parse_front_matter_from_lines(lines, H)
+
+def _parse_front_matter_from_lines(lines, H):
+    if not lines:
+        return {"title": "", "authors": [], "affiliations": {}}
+
+    header_end_y = find_header_end_y(lines, H)
+    absinfo_y = find_y(lines, RE_ARTINFO) or find_y(lines, RE_ABS_HDR)
+    if absinfo_y is None:
+        absinfo_y = H * 0.62
+
+    content_start_y = header_end_y
+    content_end_y = min(absinfo_y, H * 0.45)
+
+    top = [li for li in lines
+           if content_start_y <= li["y"] < content_end_y
+           and not is_header_banner(li["text"])]
+
+    if not top:
+        return {"title": "", "authors": [], "affiliations": {}}
+
+    # top is already banner-free, so candidates need no second banner check
+    max_font = max(li["max_size"] for li in top)
+    title_candidates = [li for li in top if li["max_size"] >= max_font - 1.5]
+    title_candidates.sort(key=lambda x: x["y"])
+
+    title_lines, last_y = [], None
+    for li in title_candidates:
+        if last_y is None or abs(li["y"] - last_y) <= 20:
+            title_lines.append(li)
+            last_y = li["y"]
+        else:
+            break
 
-        title = " ".join(li["text"] for li in title_lines).strip()
-        title = fix_merged_text(title)
-        title_bottom_y = title_lines[-1]["y"] if title_lines else content_start_y
+    title = " ".join(li["text"] for li in title_lines).strip()
+    title = fix_merged_text(title)
+    title_bottom_y = title_lines[-1]["y"] if title_lines else content_start_y
 
-        zone = [li for li in lines
-                if title_bottom_y + 5 < li["y"] < absinfo_y
-                and not is_header_banner(li["text"])]
+    zone = [li for li in lines
+            if title_bottom_y + 5 < li["y"] < absinfo_y
+            and not is_header_banner(li["text"])]
 
-        has_markers = False
-        aff_start = None
-        for i, li in enumerate(zone):
-            t = li["text"].strip()
-            if RE_ARTINFO.search(t) or RE_ABS_HDR.search(t) or RE_STOP_ANY.search(t):
-                aff_start = i
-                break
-            if re.match(r"^\s*[a-z]\s+[A-Z]", t) or re.match(r"^\s*[a-z][A-Z]", t):
-                has_markers = True
-                aff_start = i
-                break
-            if AFF_CUES.search(t):
-                has_markers = False
-                aff_start = i
-                break
+    has_markers = False
+    aff_start = None
+    for i, li in enumerate(zone):
+        t = li["text"]
+        if RE_FRONT_STOP.search(t):
+            aff_start = i
+            break
+        if RE_MARKER_START.match(t):
+            has_markers = True
+            aff_start = i
+            break
+        if AFF_CUES.search(t):
+            aff_start = i
+            break
 
-        if aff_start is None:
-            author_lines = zone[:2]
-            aff_lines = zone[2:]
-        else:
-            author_lines = zone[:aff_start]
-            aff_lines = zone[aff_start:]
+    if aff_start is None:
+        author_lines = zone[:2]
+        aff_lines = zone[2:]
+    else:
+        author_lines = zone[:aff_start]
+        aff_lines = zone[aff_start:]
 
-        author_text = " ".join(li["text"] for li in author_lines).strip()
+    author_text = " ".join(li["text"] for li in author_lines).strip()
 
-        if has_markers:
-            authors = parse_authors_with_markers(author_lines)
-            affiliations = parse_affiliations_with_markers(aff_lines)
-        else:
-            authors, extra_aff = parse_authors_without_markers(author_text)
-            aff_text = " ".join(li["text"] for li in aff_lines).strip()
-            combined_aff = (extra_aff + " " + aff_text).strip() if extra_aff or aff_text else ""
-            affiliations = parse_affiliations_without_markers(combined_aff)
+    if has_markers:
+        authors = parse_authors_with_markers(author_lines)
+        affiliations = parse_affiliations_with_markers(aff_lines)
+    else:
+        authors, extra_aff = parse_authors_without_markers(author_text)
+        aff_text = " ".join(li["text"] for li in aff_lines).strip()
+        combined_aff = (extra_aff + " " + aff_text).strip() if extra_aff or aff_text else ""
+        affiliations = parse_affiliations_without_markers(combined_aff)
 
-        return {"title": title, "authors": authors, "affiliations": affiliations}
+    return {"title": title, "authors": authors, "affiliations": affiliations}
 
 
 
 # KEYWORDS + ABSTARCT
-def extract_kw_abs_from_lines(lines):
-    clean_lines = [li for li in lines if not is_header_banner(li["text"])]
-
-    kw_idx = None
-    abs_idx = None
-    intro_idx = None
+@lru_cache(maxsize=None)
+def section_hdr_re(names):
+    """Alternation of the given SECTION_HDRS; match.lastgroup names the header hit."""
+    return re.compile("|".join(f"(?P<{n}>{p})" for n, p in SECTION_HDRS if n in names), re.I)
 
-    for i, li in enumerate(clean_lines):
+def extract_kw_abs_from_lines(lines):
+    # line texts come from cluster_lines, already stripped and single-spaced
+    # Drop banner lines and, in the same pass, note the first clean-line index of
+    # each section header (one line can hold several). One regex per line,
+    # covering only the headers not seen yet; none once all are found.
+    clean_lines = []
+    append = clean_lines.append
+    first = {}
+    hdr_re = section_hdr_re(("kw", "abs", "intro"))
+    for li in lines:
         t = li["text"]
-        if kw_idx is None and RE_KEYWORDS_HDR.search(t):
-            kw_idx = i
-        if abs_idx is None and RE_ABS_HDR.search(t):
-            abs_idx = i
-        if intro_idx is None and RE_INTRO.search(t):
-            intro_idx = i
+        if is_header_banner(t):
+            continue
+        append(li)
+        if hdr_re is None:
+            continue
+        seen = len(first)
+        for m in hdr_re.finditer(t):
+            first.setdefault(m.lastgroup, len(clean_lines) - 1)
+        if len(first) != seen:
+            missing = tuple(n for n, _ in SECTION_HDRS if n not in first)
+            hdr_re = section_hdr_re(missing) if missing else None
+    kw_idx, abs_idx, intro_idx = first.get("kw"), first.get("abs"), first.get("intro")
 
     # KEYWORDS
     keywords_text = ""
@@ -432,7 +551,7 @@ def extract_kw_abs_from_lines(lines):
 
         kw_lines = clean_lines[kw_idx:end_kw]
         first_line = kw_lines[0]["text"]
-        m = re.search(r"(?i)\bKeywords?\b\s*:?\s*(.*)$", first_line)
+        m = RE_KW_PREFIX.search(first_line)
         parts = [m.group(1).strip()] if m and m.group(1) else []
 
         for li in kw_lines[1:]:
@@ -442,7 +561,7 @@ def extract_kw_abs_from_lines(lines):
             parts.append(t)
 
         if parts:
-            keywords_text = re.sub(r"\s+", " ", " ".join(parts)).strip()
+            keywords_text = " ".join(parts).strip()
 
     # ABSTRACT
     abstract_text = ""
@@ -454,7 +573,7 @@ def extract_kw_abs_from_lines(lines):
 
         abs_lines = clean_lines[abs_idx:end_abs]
         first_line = abs_lines[0]["text"]
-        m = re.search(r"(?i)\bAbstract\b\s*:?\s*(.*)$", first_line)
+        m = RE_ABS_PREFIX.search(first_line)
         parts = [m.group(1).strip()] if m and m.group(1) else []
 
         for li in abs_lines[1:]:
@@ -464,7 +583,7 @@ def extract_kw_abs_from_lines(lines):
             parts.append(t)
 
         if parts:
-            abstract_text = re.sub(r"\s+", " ", " ".join(parts)).strip()
+            abstract_text = " ".join(parts).strip()
 
     return keywords_text, abstract_text
 
@@ -480,9 +599,9 @@ def flatten_authors(authors):
             continue
 
         markers = a.get("markers") or []
-        numeric = "".join(m for m in markers if re.fullmatch(r"\d+", m))
+        numeric = "".join(m for m in markers if RE_DIGITS.fullmatch(m))
         if numeric:
-            name = name + numeric.translate(DIGIT_TO_SUP)
+            name = name + (DIGIT_SUP.get(numeric) or numeric.translate(DIGIT_TO_SUP))
 
         if a.get("corresponding"):
             name = name + " ∗"
@@ -497,9 +616,14 @@ def flatten_affiliations(affiliations):
     if isinstance(affiliations, dict):
         if "all" in affiliations and isinstance(affiliations["all"], str):
             return affiliations["all"].strip()
+        # markers are normally inserted a, b, c...; only sort when they weren't
+        pairs = affiliations.items()
+        nxt = iter(affiliations)
+        next(nxt, None)
+        if any(a > b for a, b in zip(affiliations, nxt)):
+            pairs = sorted(pairs)
         items = []
-        for k in sorted(affiliations.keys()):
-            v = affiliations.get(k)
+        for k, v in pairs:
             if isinstance(v, str) and v.strip():
                 # keep marker label so mapping isn't lost
                 items.append(f"{k} {v.strip()}")
@@ -515,27 +639,64 @@ def load_timeout_filenames(error_log_path: Path):
     files, seen = [], set()
     with open(error_log_path, "r", encoding="utf-8", errors="replace") as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
             if "TIMEOUT>90s" not in line:
                 continue
-            parts = line.split("\t")
-            if len(parts) < 2:
+            m = RE_TIMEOUT_LINE.match(line.strip())
+            if not m:
                 continue
-            fn = parts[1].strip()
-            if fn.lower().endswith(".pdf") and fn not in seen:
+            fn = m.group(1)
+            if fn not in seen:
                 seen.add(fn)
                 files.append(fn)
     return files
 
-def log_stage2_error(fn: str, reason: str):
+def log_stage2_error(err_log, fn: str, reason: str):
     ts = datetime.now().isoformat(timespec="seconds")
-    with open(STAGE_TIMEOUT_ERROR_LOG, "a", encoding="utf-8") as f:
-        f.write(f"{ts}\t{fn}\t{reason}\n")
+    err_log.write(f"{ts}\t{fn}\t{reason}\n")
 
 
 # MAIN
+def write_json(path, obj):
+    # one serialize + one write; orjson emits UTF-8 unescaped like ensure_ascii=False
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+
+def process_file(fn: str):
+    """Parses one PDF and writes its JSON. Runs in a worker; returns (fn, status, seconds, reason)."""
+    # plain str paths: no Path objects per file, one stat for the existence check
+    pdf_path = os.path.join(PDF_DIR, fn)
+    out_path = os.path.join(OUT_DIR, os.path.splitext(os.path.basename(fn))[0] + ".json")
+    t0 = time.time()
+
+    if not os.path.isfile(pdf_path):
+        return fn, "MISSING", 0.0, "FILE_NOT_FOUND"
+
+    try:
+        # page 1 is parsed once and shared by meta and kw/abs
+        lines, H = read_page1_lines(pdf_path)
+        fm = _parse_front_matter_from_lines(lines, H)
+        keywords_text, abstract_text = extract_kw_abs_from_lines(lines)
+
+        result = {
+            "filename": fn,
+            "title": (fm.get("title") or ""),
+            "authors": flatten_authors(fm.get("authors", [])),
+            "affiliations": flatten_affiliations(fm.get("affiliations", {})),
+            "keywords": (keywords_text or ""),
+            "abstract": (abstract_text or "")
+        }
+
+        write_json(out_path, result)
+
+        return fn, "OK", time.time() - t0, None
+
+    except Exception as e:
+        return fn, "ERROR", time.time() - t0, repr(e)
+
 def main():
     files = load_timeout_filenames(ERROR_LOG)
     print(f"Found {len(files)} TIMEOUT PDFs in error.log")
@@ -546,51 +707,27 @@ def main():
     err = 0
     missing = 0
 
-    for i, fn in enumerate(files, start=1):
-        pdf_path = PDF_DIR / fn
-        out_path = OUT_DIR / f"{pdf_path.stem}.json"
-
-        print(f"[{i}/{len(files)}] {fn}", end=" ... ")
-        t0 = time.time()
-
-        if not pdf_path.exists():
-            missing += 1
-            log_stage2_error(fn, "FILE_NOT_FOUND")
-            print("MISSING")
-            continue
-
-        try:
-            # meta
-            fm = parse_front_matter_page1(pdf_path)
-
-            # layout lines for kw/abs
-            with pdfplumber.open(str(pdf_path)) as pdf:
-                page = pdf.pages[0]
-                words = page.extract_words(extra_attrs=["size"], use_text_flow=True) or []
-                lines = cluster_lines(words, y_tol=3.0) if words else []
-
-            keywords_text, abstract_text = extract_kw_abs_from_lines(lines)
-
-            result = {
-                "filename": fn,
-                "title": (fm.get("title") or ""),
-                "authors": flatten_authors(fm.get("authors", [])),
-                "affiliations": flatten_affiliations(fm.get("affiliations", {})),
-                "keywords": (keywords_text or ""),
-                "abstract": (abstract_text or "")
-            }
-
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-
-            ok += 1
-            print(f"OK ({time.time() - t0:.2f}s)")
-
-        except Exception as e:
-            err += 1
-            reason = repr(e)
-            log_stage2_error(fn, reason)
-            print(f"ERROR ({time.time() - t0:.2f}s) -> {reason[:160]}")
+    # Files are independent and parsing is CPU-bound, so fan out over processes;
+    # counting and the stage2 log stay in the parent so the log has one writer,
+    # kept open (line-buffered) for the whole run.
+    with open(STAGE_TIMEOUT_ERROR_LOG, "a", encoding="utf-8", buffering=1) as err_log, \
+            ProcessPoolExecutor(max_workers=N_WORKERS) as executor:
+        futures = [executor.submit(process_file, fn) for fn in files]
+        for i, future in enumerate(as_completed(futures), start=1):
+            fn, status, elapsed, reason = future.result()
+            print(f"[{i}/{len(files)}] {fn}", end=" ... ")
+
+            if status == "MISSING":
+                missing += 1
+                log_stage2_error(err_log, fn, reason)
+                print("MISSING")
+            elif status == "OK":
+                ok += 1
+                print(f"OK ({elapsed:.2f}s)")
+            else:
+                err += 1
+                log_stage2_error(err_log, fn, reason)
+                print(f"ERROR ({elapsed:.2f}s) -> {reason[:160]}")
 
     print("\nDone.")
     print(f"OK: {ok}")